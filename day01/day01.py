@@ -3,42 +3,220 @@
 import argparse
 import sys
 from pathlib import Path
+import typing
+import heapq
+import itertools
+import mmap
+import os
+import concurrent.futures
+import array
+import json
+import re
+import numpy as np
 
+# Calorie values of every elf's snacks, concatenated, and the index into that array at which each elf's snacks start.
+InputData = tuple[np.ndarray, np.ndarray]
 
-def load(input_path: Path) -> list[list[int]]:
-    elf = []
-    elves = []
-    with open(input_path) as f:
-        while True:
-            line = f.readline()
-            if not line or not line.strip():
-                # EOF or blank line
-                elves.append(elf)
-                elf = []
-                if not line:
-                    # EOF
-                    break
-            line = line.strip()
-            if line:
-                elf.append(int(line))
-    return elves
 
+def load(input_path: Path) -> InputData:
+    values = array.array("q")
+    offsets = array.array("q")
+    new_elf = True
+    with open(input_path, "rb") as f:
+        for line in f:
+            if line.strip():
+                if new_elf:
+                    offsets.append(len(values))
+                    new_elf = False
+                values.append(int(line))
+            else:
+                new_elf = True
+    return np.frombuffer(values, dtype=np.int64), np.frombuffer(offsets, dtype=np.int64)
 
-def part1(elves: list[list[int]]) -> int:
-    return max([sum(elf) for elf in elves])
 
+def elf_totals(input_data: InputData) -> np.ndarray:
+    """Total calories carried by each elf."""
+    values, offsets = input_data
+    if len(offsets) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.add.reduceat(values, offsets)
 
-def part2(elves: list[list[int]]) -> int:
-    return sum(sorted([sum(elf) for elf in elves])[-3:])
+
+def largest_totals(input_data: InputData, k: int) -> np.ndarray:
+    """The k largest elf totals, in no particular order."""
+    totals = elf_totals(input_data)
+    if k >= len(totals):
+        return totals
+    return np.partition(totals, -k)[-k:]
+
+
+def line_totals(lines: typing.Iterable[bytes]) -> typing.Generator[int, None, None]:
+    """Yield the total calories carried by each elf, where elves are separated by blank (or whitespace-only) lines."""
+    total = 0
+    for line in lines:
+        if line.strip():
+            total += int(line)
+        else:
+            yield total
+            total = 0
+    yield total
+
+
+def stream_totals(input_path: Path) -> typing.Generator[int, None, None]:
+    """Yield the total calories carried by each elf, reading the input one line at a time."""
+    with open(input_path, "rb") as f:
+        yield from line_totals(f)
+
+
+def push_total(top: list[int], total: int, k: int) -> None:
+    """Add total to the min-heap top, keeping only the k largest totals seen."""
+    if len(top) < k:
+        heapq.heappush(top, total)
+    elif total > top[0]:
+        heapq.heapreplace(top, total)
+
+
+def top_totals(totals: typing.Iterable[int], k: int) -> list[int]:
+    """The k largest totals, largest first. Uses O(k) memory regardless of how many totals there are."""
+    top = []
+    for total in totals:
+        push_total(top, total, k)
+    return sorted(top, reverse=True)
+
+
+# A line containing nothing but whitespace, including the newlines either side
+BLANK_LINE = re.compile(rb"\n[ \t\r]*\n")
+
+
+def chunk_bounds(mm: mmap.mmap, chunk_size: int) -> list[tuple[int, int]]:
+    """Split the mapped input into (start, end) byte ranges of roughly chunk_size, each ending after a blank line."""
+    bounds = []
+    start = 0
+    while (match := BLANK_LINE.search(mm, start + chunk_size)) is not None:
+        bounds.append((start, match.end()))
+        start = match.end()
+    bounds.append((start, len(mm)))
+    return bounds
+
+
+def chunk_top_totals(input_path: Path, start: int, end: int, k: int) -> list[int]:
+    """The k largest elf totals within bytes [start, end) of the input, which must begin and end on elf boundaries."""
+    with open(input_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return top_totals(line_totals(mm[start:end].splitlines()), k)
+
+
+def parallel_top_totals(input_path: Path, k: int, jobs: int | None = None, chunk_size: int = 64 * 1024 * 1024) -> list[int]:
+    """
+    The k largest elf totals, largest first.
+    The input is memory-mapped and split into chunks on blank lines, and each chunk is totalled in a separate
+    process. Each worker only returns its own top k, so merging the results is cheap.
+    """
+    with open(input_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Can't mmap an empty file.
+            return top_totals([0], k)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            starts, ends = zip(*chunk_bounds(mm, chunk_size))
+
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        partials = executor.map(chunk_top_totals, itertools.repeat(input_path), starts, ends, itertools.repeat(k))
+        return top_totals(itertools.chain.from_iterable(partials), k)
+
+
+class TotalsCheckpoint:
+    def __init__(self, k: int, offset: int = 0, open_total: int = 0, top: list[int] | None = None):
+        self.k: int = k
+        self.offset: int = offset  # Bytes of input consumed, always at the start of a line
+        self.open_total: int = open_total  # Running total of the elf whose snacks are still being read
+        self.top: list[int] = top if top is not None else []  # Min-heap of the k largest completed elf totals
+
+    @staticmethod
+    def load(checkpoint_path: Path, k: int) -> "TotalsCheckpoint":
+        """Load a saved checkpoint, or start a fresh one if there isn't one for this k."""
+        if not checkpoint_path.exists():
+            return TotalsCheckpoint(k)
+        with open(checkpoint_path) as f:
+            state = json.load(f)
+        if state["k"] != k:
+            return TotalsCheckpoint(k)
+        heapq.heapify(state["top"])
+        return TotalsCheckpoint(k, state["offset"], state["open_total"], state["top"])
+
+    def save(self, checkpoint_path: Path) -> None:
+        # Write then rename, so an interrupted save can't leave a corrupt checkpoint behind.
+        tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"k": self.k, "offset": self.offset, "open_total": self.open_total, "top": self.top}, f)
+        os.replace(tmp_path, checkpoint_path)
+
+
+def incremental_top_totals(input_path: Path, checkpoint_path: Path, k: int) -> list[int]:
+    """
+    The k largest elf totals, largest first, for an input that is only ever appended to.
+    Only the data appended since the last call is read; progress is saved to checkpoint_path between calls.
+    """
+    checkpoint = TotalsCheckpoint.load(checkpoint_path, k)
+    if os.path.getsize(input_path) < checkpoint.offset:
+        # Input has been truncated or replaced, so start again.
+        checkpoint = TotalsCheckpoint(k)
+
+    pending = 0
+    with open(input_path, "rb") as f:
+        f.seek(checkpoint.offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # The last line may still be being written. Count it in this answer, but don't consume it.
+                if line.strip():
+                    pending = int(line)
+                break
+            checkpoint.offset += len(line)
+            if line.strip():
+                checkpoint.open_total += int(line)
+            else:
+                push_total(checkpoint.top, checkpoint.open_total, k)
+                checkpoint.open_total = 0
+    checkpoint.save(checkpoint_path)
+
+    return top_totals(checkpoint.top + [checkpoint.open_total + pending], k)
+
+
+def part1(input_data: InputData) -> int:
+    return int(largest_totals(input_data, 1).sum())
+
+
+def part2(input_data: InputData) -> int:
+    return int(largest_totals(input_data, 3).sum())
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-1", "--part1", action="store_true")
     parser.add_argument("-2", "--part2", action="store_true")
+    parser.add_argument("-k", "--top", type=int, help="stream the input, and sum the calories of the top TOP elves")
+    parser.add_argument("-j", "--jobs", type=int, help="with --top, parse the input in parallel using JOBS processes")
+    parser.add_argument("-c", "--checkpoint", type=Path, help="with --top, only read input appended since the last run, saving progress to CHECKPOINT")
     parser.add_argument("input")
     args = parser.parse_args()
 
+    if args.top is not None:
+        if args.part1 or args.part2:
+            sys.exit("--top cannot be combined with --part1 or --part2.")
+        if args.top < 1:
+            sys.exit("--top must be at least 1.")
+        if args.jobs is not None and args.checkpoint is not None:
+            sys.exit("--jobs cannot be combined with --checkpoint.")
+        if args.checkpoint is not None:
+            print(sum(incremental_top_totals(Path(args.input), args.checkpoint, args.top)))
+        elif args.jobs is not None:
+            if args.jobs < 1:
+                sys.exit("--jobs must be at least 1.")
+            print(sum(parallel_top_totals(Path(args.input), args.top, args.jobs)))
+        else:
+            print(sum(top_totals(stream_totals(Path(args.input)), args.top)))
+        sys.exit()
+
+    if args.jobs is not None or args.checkpoint is not None:
+        sys.exit("--jobs and --checkpoint can only be used with --top.")
     if args.part1 == args.part2:
         sys.exit("Exactly one of --part1 or --part2 must be specified.")
 
@@ -30,3 +30,45 @@ def test_part1(input_path: Path, answer1: int) -> None:
 
 def test_part2(input_path: Path, answer2: int) -> None:
     assert part2(load(input_path)) == answer2
+
+
+def test_stream_part1(input_path: Path, answer1: int) -> None:
+    assert sum(top_totals(stream_totals(input_path), 1)) == answer1
+
+
+def test_stream_part2(input_path: Path, answer2: int) -> None:
+    assert sum(top_totals(stream_totals(input_path), 3)) == answer2
+
+
+def test_parallel_part1(input_path: Path, answer1: int) -> None:
+    assert sum(parallel_top_totals(input_path, 1, 2, chunk_size=8)) == answer1
+
+
+def test_parallel_part2(input_path: Path, answer2: int) -> None:
+    assert sum(parallel_top_totals(input_path, 3, 2, chunk_size=8)) == answer2
+
+
+def test_parallel_blank_lines(input_path: Path, answer2: int, tmp_path: Path) -> None:
+    # CRLF line endings and whitespace-only blank lines must still separate elves, as they do for load().
+    with open(input_path, "rb") as f:
+        lines = f.read().splitlines()
+    for separator, blank in [(b"\r\n", b""), (b"\n", b" \t"), (b"\r\n", b" ")]:
+        variant_path = tmp_path / "input"
+        with open(variant_path, "wb") as f:
+            f.write(b"".join([(line or blank) + separator for line in lines]))
+        assert parallel_top_totals(variant_path, 3, 2, chunk_size=4) == top_totals(stream_totals(input_path), 3)
+        assert sum(parallel_top_totals(variant_path, 3, 2, chunk_size=4)) == answer2
+
+
+def test_incremental_part2(input_path: Path, answer2: int, tmp_path: Path) -> None:
+    # Feed the input in two halves, splitting mid-line, checking the resumed answer matches a full parse.
+    with open(input_path, "rb") as f:
+        contents = f.read()
+    appended_path = tmp_path / "input"
+    checkpoint_path = tmp_path / "checkpoint"
+    with open(appended_path, "wb") as f:
+        f.write(contents[:len(contents) // 2])
+    assert incremental_top_totals(appended_path, checkpoint_path, 3) == top_totals(stream_totals(appended_path), 3)
+    with open(appended_path, "ab") as f:
+        f.write(contents[len(contents) // 2:])
+    assert sum(incremental_top_totals(appended_path, checkpoint_path, 3)) == answer2
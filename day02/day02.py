@@ -4,6 +4,8 @@ import argparse
 import sys
 from pathlib import Path
 from enum import Enum
+import typing
+import numpy as np
 
 
 class Move(Enum):
@@ -18,16 +20,41 @@ class Outcome(Enum):
     Win = 6
 
 
-def load(input_path: Path) -> list[tuple[str, str]]:
-    moves = []
-    with open(input_path) as f:
-        while True:
-            line = f.readline()
-            if not line:
-                break
-            line = line.strip().split(" ")
-            moves.append((line[0], line[1]))
-    return moves
+# Number of times each line appears in the strategy guide, counts[first column, second column],
+# with A/X, B/Y, C/Z mapped to 0, 1, 2
+InputData = np.ndarray
+
+# Lines decoded per read, so memory use stays bounded however large the guide is
+CHUNK_LINES = 1 << 22
+
+
+def load(input_path: Path) -> InputData:
+    # Every line is the same length ("A X\n", or "A X\r\n" with CRLF line endings), so each chunk can be viewed
+    # as an (n, line length) array of bytes.
+    counts = np.zeros(9, dtype=np.int64)
+    with open(input_path, "rb") as f:
+        first_line = f.readline()
+        line_ending = b"\r\n" if first_line.endswith(b"\r\n") else b"\n"
+        stride = 3 + len(line_ending)
+        f.seek(0)
+        expected = np.frombuffer(b"  " + line_ending, dtype=np.uint8)
+        while chunk := f.read(CHUNK_LINES * stride):
+            if len(chunk) % stride == 3:
+                # Final line has no line ending.
+                chunk += line_ending
+            if len(chunk) % stride != 0:
+                raise ValueError(f"Strategy guide lines must all be {stride} bytes long")
+            lines = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, stride)
+            opponent = lines[:, 0].astype(np.int16) - ord("A")
+            own = lines[:, 2].astype(np.int16) - ord("X")
+            if (
+                    not ((0 <= opponent) & (opponent < 3) & (0 <= own) & (own < 3)).all()
+                    or not (lines[:, 1] == expected[0]).all()
+                    or not (lines[:, 3:] == expected[2:]).all()
+            ):
+                raise ValueError("Unexpected character in strategy guide")
+            counts += np.bincount(opponent * 3 + own, minlength=9)
+    return counts.reshape(3, 3)
 
 
 def match_outcome(opponent: Move, own: Move) -> Outcome:
@@ -43,16 +70,54 @@ def score_part1(move: tuple[str, str]) -> int:
     return {"X": 1, "Y": 2, "Z": 3}[move[1]] + match_outcome({"A": Move.Rock, "B": Move.Paper, "C": Move.Scissors}[move[0]], {"X": Move.Rock, "Y": Move.Paper, "Z": Move.Scissors}[move[1]]).value
 
 
-def part1(moves: list[tuple[str, str]]) -> int:
-    return sum([score_part1(m) for m in moves])
+def score_part2(move: tuple[str, str]) -> int:
+    opponent = {"A": Move.Rock, "B": Move.Paper, "C": Move.Scissors}[move[0]]
+    outcome = {"X": Outcome.Loss, "Y": Outcome.Draw, "Z": Outcome.Win}[move[1]]
+    own = Move(((opponent.value + {Outcome.Draw: 0, Outcome.Win: 1, Outcome.Loss: 2}[outcome]) - 1) % 3 + 1)
+    return own.value + outcome.value
 
 
-def part2(moves: list[tuple[str, str]]) -> int:
-    score = 0
-    for opponent, outcome in [({"A": Move.Rock, "B": Move.Paper, "C": Move.Scissors}[a], {"X": Outcome.Loss, "Y": Outcome.Draw, "Z": Outcome.Win}[b]) for (a, b) in moves]:
-        own = Move(((opponent.value + {Outcome.Draw: 0, Outcome.Win: 1, Outcome.Loss: 2}[outcome]) - 1) % 3 + 1)
-        score += own.value + outcome.value
-    return score
+# Score for each kind of line, indexed the same way as InputData
+PART1_SCORES = np.array([[score_part1((a, b)) for b in "XYZ"] for a in "ABC"])
+PART2_SCORES = np.array([[score_part2((a, b)) for b in "XYZ"] for a in "ABC"])
+
+
+def total_score(counts: InputData, scores: np.ndarray) -> int:
+    return int((counts * scores).sum())
+
+
+def move_mapping_scores(mapping: dict[str, Move]) -> np.ndarray:
+    """Score table for reading the second column as the player's own move, as in part 1."""
+    opponent_moves = {"A": Move.Rock, "B": Move.Paper, "C": Move.Scissors}
+    return np.array([[mapping[b].value + match_outcome(opponent_moves[a], mapping[b]).value for b in "XYZ"] for a in "ABC"])
+
+
+def outcome_mapping_scores(mapping: dict[str, Outcome]) -> np.ndarray:
+    """Score table for reading the second column as the required outcome, as in part 2."""
+    opponent_moves = {"A": Move.Rock, "B": Move.Paper, "C": Move.Scissors}
+    scores = np.zeros((3, 3), dtype=np.int64)
+    for i, a in enumerate("ABC"):
+        for j, b in enumerate("XYZ"):
+            own = next(m for m in Move if match_outcome(opponent_moves[a], m) == mapping[b])
+            scores[i, j] = own.value + mapping[b].value
+    return scores
+
+
+def batch_scores(counts: InputData, score_tables: typing.Iterable[np.ndarray]) -> list[int]:
+    """
+    Total score of the strategy guide under each of the given 3x3 score tables.
+    The guide is only read once (by load), so scoring many candidate tables costs one small matrix product.
+    """
+    tables = np.array(list(score_tables), dtype=np.int64).reshape(-1, 9)
+    return [int(score) for score in tables @ counts.reshape(9)]
+
+
+def part1(counts: InputData) -> int:
+    return total_score(counts, PART1_SCORES)
+
+
+def part2(counts: InputData) -> int:
+    return total_score(counts, PART2_SCORES)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 from day02 import *
 
 from pathlib import Path
+import itertools
 
 
 def load_answer(path: Path) -> int:
@@ -30,3 +31,40 @@ def test_part1(input_path: Path, answer1: int) -> None:
 
 def test_part2(input_path: Path, answer2: int) -> None:
     assert part2(load(input_path)) == answer2
+
+
+def load_lines(path: Path) -> list[tuple[Move, str]]:
+    with open(path) as f:
+        return [({"A": Move.Rock, "B": Move.Paper, "C": Move.Scissors}[line[0]], line[2]) for line in f.read().splitlines()]
+
+
+def test_batch_part1(input_path: Path, answer1: int) -> None:
+    mappings = [dict(zip("XYZ", moves)) for moves in itertools.permutations([Move.Rock, Move.Paper, Move.Scissors])]
+    scores = batch_scores(load(input_path), [move_mapping_scores(m) for m in mappings])
+    lines = load_lines(input_path)
+    assert scores == [sum([m[b].value + match_outcome(a, m[b]).value for a, b in lines]) for m in mappings]
+    assert scores[0] == answer1
+
+
+def test_batch_part2(input_path: Path, answer2: int) -> None:
+    mappings = [dict(zip("XYZ", outcomes)) for outcomes in itertools.permutations([Outcome.Loss, Outcome.Draw, Outcome.Win])]
+    scores = batch_scores(load(input_path), [outcome_mapping_scores(m) for m in mappings])
+    lines = load_lines(input_path)
+    expected = []
+    for m in mappings:
+        score = 0
+        for a, b in lines:
+            own = next(own for own in Move if match_outcome(a, own) == m[b])
+            score += own.value + m[b].value
+        expected.append(score)
+    assert scores == expected
+    assert scores[0] == answer2
+
+
+def test_crlf_part1(input_path: Path, answer1: int, tmp_path: Path) -> None:
+    with open(input_path, "rb") as f:
+        lines = f.read().splitlines()
+    crlf_path = tmp_path / "input"
+    with open(crlf_path, "wb") as f:
+        f.write(b"".join([line + b"\r\n" for line in lines]))
+    assert part1(load(crlf_path)) == answer1
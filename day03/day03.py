@@ -6,40 +6,145 @@ from pathlib import Path
 import string
 import operator
 import functools
+import itertools
+import typing
+import numpy as np
 
 
-def load(input_path: Path) -> list[list[str]]:
-    rucksacks = []
-    with open(input_path) as f:
+# Each rucksack as a pair of bitmasks, one per compartment.
+# Bit n is set if the compartment contains the item with priority n + 1.
+InputData = list[tuple[int, int]]
+
+# Item presence for each rucksack, presence[rucksack, compartment, priority - 1]
+PresenceData = np.ndarray
+
+ITEM_BITS = {ord(c): 1 << i for i, c in enumerate(string.ascii_letters)}
+
+# Maps each byte to its item's priority - 1, or -1 for bytes that aren't items
+ITEM_INDICES = np.full(256, -1, dtype=np.int8)
+ITEM_INDICES[[ord(c) for c in string.ascii_letters]] = np.arange(len(string.ascii_letters))
+
+
+def item_mask(items: bytes) -> int:
+    mask = 0
+    for c in set(items):
+        mask |= ITEM_BITS[c]
+    return mask
+
+
+def stream_rucksacks(input_path: Path) -> typing.Generator[tuple[int, int], None, None]:
+    """Yield each rucksack's compartment masks, reading the input one line at a time."""
+    with open(input_path, "rb") as f:
         while True:
             line = f.readline()
             if not line:
                 break
             line = line.strip()
-            rucksacks.append(list(line))
-    return rucksacks
+            yield item_mask(line[:len(line) // 2]), item_mask(line[len(line) // 2:])
+
+
+def load(input_path: Path) -> InputData:
+    return list(stream_rucksacks(input_path))
+
+
+def priority(mask: int) -> int:
+    """Priority of the single item in mask."""
+    return mask.bit_length()
+
+
+def group_badges(rucksacks: typing.Iterable[tuple[int, int]], group_size: int) -> typing.Generator[int, None, None]:
+    """
+    Yield the priority of the item common to each consecutive group of group_size rucksacks.
+    Raises ValueError if the last group is short, or a group doesn't have exactly one item in common.
+    """
+    rucksacks = iter(rucksacks)
+    while group := list(itertools.islice(rucksacks, group_size)):
+        if len(group) != group_size:
+            raise ValueError("Number of rucksacks must be a multiple of the group size")
+        common = functools.reduce(operator.and_, [a | b for a, b in group])
+        if common.bit_count() != 1:
+            raise ValueError("Every group must have exactly one item in common")
+        yield priority(common)
 
 
-def part1(rucksacks: list[list[str]]) -> int:
-    return sum([string.ascii_letters.find((set(rucksack[:len(rucksack) // 2]) & set(rucksack[len(rucksack) // 2:])).pop()) + 1 for rucksack in rucksacks])
+def part1(rucksacks: typing.Iterable[tuple[int, int]]) -> int:
+    return sum(priority(a & b) for a, b in rucksacks)
 
 
-def part2(rucksacks: list[list[str]]) -> int:
-    return sum([string.ascii_letters.find(functools.reduce(operator.and_, group, set(string.ascii_letters)).pop()) + 1 for group in [[set(elem) for elem in rucksacks[i:i+3]] for i in range(0, len(rucksacks), 3)]])
+def part2(rucksacks: typing.Iterable[tuple[int, int]], group_size: int = 3) -> int:
+    return sum(group_badges(rucksacks, group_size))
+
+
+def load_presence(input_path: Path) -> PresenceData:
+    data = np.fromfile(input_path, dtype=np.uint8)
+    # Use the narrowest index type that can number every byte, to keep working memory per input byte down.
+    index_type = np.int32 if len(data) < 2 ** 31 else np.int64
+
+    # Line number of every item in the file.
+    items = ITEM_INDICES[data]
+    is_item = items >= 0
+    lines = np.cumsum(data == ord("\n"), dtype=index_type)[is_item]
+    items = items[is_item]
+    del data, is_item
+
+    # Renumber the lines that contain items, so blank lines don't become empty rucksacks.
+    line_lengths = np.bincount(lines)
+    rucksack_numbers = np.cumsum(line_lengths > 0, dtype=index_type) - 1
+    rows = rucksack_numbers[lines]
+    rucksack_lengths = line_lengths[line_lengths > 0].astype(index_type)
+    rucksack_count = len(rucksack_lengths)
+    del lines, line_lengths, rucksack_numbers
+
+    # Position of each item within its rucksack, and which compartment that puts it in.
+    rucksack_starts = np.cumsum(rucksack_lengths, dtype=index_type) - rucksack_lengths
+    positions = np.arange(len(items), dtype=index_type) - rucksack_starts[rows]
+    compartments = (positions >= rucksack_lengths[rows] // 2).astype(np.int8)
+
+    presence = np.zeros((rucksack_count, 2, len(string.ascii_letters)), dtype=bool)
+    presence[rows, compartments, items] = True
+    return presence
+
+
+def presence_priorities(common: np.ndarray) -> np.ndarray:
+    """Priority of the item in each row of common, or 0 for rows with no item, as for priority()."""
+    return (common.argmax(axis=1) + 1) * common.any(axis=1)
+
+
+def part1_presence(presence: PresenceData) -> int:
+    common = presence[:, 0] & presence[:, 1]
+    return int(presence_priorities(common).sum())
+
+
+def part2_presence(presence: PresenceData) -> int:
+    if len(presence) % 3 != 0:
+        raise ValueError("Number of rucksacks must be a multiple of the group size")
+    rucksacks = presence[:, 0] | presence[:, 1]
+    common = rucksacks.reshape(-1, 3, rucksacks.shape[1]).all(axis=1)
+    if not (common.sum(axis=1) == 1).all():
+        raise ValueError("Every group must have exactly one item in common")
+    return int(presence_priorities(common).sum())
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-1", "--part1", action="store_true")
     parser.add_argument("-2", "--part2", action="store_true")
+    parser.add_argument("-g", "--group-size", type=int, default=3, help="number of rucksacks in each badge group for --part2")
     parser.add_argument("input")
     args = parser.parse_args()
 
     if args.part1 == args.part2:
         sys.exit("Exactly one of --part1 or --part2 must be specified.")
 
-    data = load(Path(args.input))
+    if args.group_size < 1:
+        sys.exit("--group-size must be at least 1.")
+
+    # Stream the rucksacks rather than loading them all, as each part only looks at one group at a time.
+    data = stream_rucksacks(Path(args.input))
     if args.part1:
         print(part1(data))
     else:  # part2
-        print(part2(data))
+        try:
+            print(part2(data, args.group_size))
+        except ValueError as e:
+            sys.exit(str(e))
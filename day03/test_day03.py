@@ -1,6 +1,10 @@
 from day03 import *
 
 from pathlib import Path
+import functools
+import operator
+import string
+import pytest
 
 
 def load_answer(path: Path) -> int:
@@ -30,3 +34,46 @@ def test_part1(input_path: Path, answer1: int) -> None:
 
 def test_part2(input_path: Path, answer2: int) -> None:
     assert part2(load(input_path)) == answer2
+
+
+def test_presence_part1(input_path: Path, answer1: int) -> None:
+    assert part1_presence(load_presence(input_path)) == answer1
+
+
+def test_presence_part2(input_path: Path, answer2: int) -> None:
+    assert part2_presence(load_presence(input_path)) == answer2
+
+
+def test_stream_part2(input_path: Path, answer2: int) -> None:
+    assert part2(stream_rucksacks(input_path)) == answer2
+
+
+def test_presence_blank_lines(input_path: Path, answer1: int, tmp_path: Path) -> None:
+    # Blank lines, including a trailing one, mustn't become extra rucksacks.
+    with open(input_path, "rb") as f:
+        lines = f.read().splitlines()
+    blank_path = tmp_path / "input"
+    with open(blank_path, "wb") as f:
+        f.write(b"\n\n".join(lines) + b"\n\n")
+    assert part1_presence(load_presence(blank_path)) == answer1
+    assert len(load_presence(blank_path)) == len(lines)
+
+
+def test_group_size_part2(input_path: Path, answer2: int, tmp_path: Path) -> None:
+    # Repeat each group of three rucksacks, so groups of six share exactly the same badge.
+    with open(input_path, "rb") as f:
+        lines = f.read().split()
+    doubled = [line for i in range(0, len(lines), 3) for line in lines[i:i + 3] * 2]
+    doubled_path = tmp_path / "input"
+    with open(doubled_path, "wb") as f:
+        f.write(b"\n".join(doubled) + b"\n")
+
+    expected = 0
+    for i in range(0, len(doubled), 6):
+        badge = functools.reduce(operator.and_, [set(line) for line in doubled[i:i + 6]])
+        expected += string.ascii_letters.find(chr(badge.pop())) + 1
+    assert part2(stream_rucksacks(doubled_path), group_size=6) == expected == answer2
+
+    # A short final group is an error, not a badge.
+    with pytest.raises(ValueError):
+        part2(load(input_path), group_size=4)
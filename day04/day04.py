@@ -3,39 +3,74 @@
 import argparse
 import sys
 from pathlib import Path
-import string
-import operator
-import functools
+import numpy as np
 
-InputData = list[tuple[tuple[int, int], tuple[int, int]]]
+# One row per pair, columns are (first start, first end, second start, second end)
+InputData = np.ndarray
+
+# Turn the "-" and "," separators into spaces, so the whole file is a flat whitespace-separated list of integers.
+SEPARATORS = bytes.maketrans(b"-,", b"  ")
 
 
 def load(input_path: Path) -> InputData:
-    pairs = []
-    with open(input_path) as f:
-        while True:
-            line = f.readline()
-            if not line:
-                break
-            line = line.strip().split(",")
-            pairs.append(tuple([tuple([int(range_half) for range_half in pair_member.split("-")]) for pair_member in line]))
-    return pairs
+    with open(input_path, "rb") as f:
+        data = f.read().rstrip()
+    values = np.fromstring(data.translate(SEPARATORS), dtype=np.int32, sep=" ")
+
+    # Translating the separators loses the line structure, so check it separately: every line must hold one ","
+    # and two "-", and between them four values.
+    raw = np.frombuffer(data, dtype=np.uint8)
+    line_ends = np.flatnonzero(raw == ord("\n"))
+    line_count = len(line_ends) + 1 if len(raw) else 0
+    comma_lines = np.searchsorted(line_ends, np.flatnonzero(raw == ord(",")))
+    dash_lines = np.searchsorted(line_ends, np.flatnonzero(raw == ord("-")))
+    if (
+            len(values) != line_count * 4
+            or not np.array_equal(comma_lines, np.arange(line_count))
+            or not np.array_equal(dash_lines, np.repeat(np.arange(line_count), 2))
+    ):
+        raise ValueError("Every line must be a pair of section ranges, like 2-4,6-8")
+    return values.reshape(-1, 4)
 
 
 def part1(pairs: InputData) -> int:
-    count = 0
-    for a, b in pairs:
-        if (a[0] >= b[0] and a[1] <= b[1]) or (b[0] >= a[0] and b[1] <= a[1]):
-            count += 1
-    return count
+    a0, a1, b0, b1 = pairs.T
+    return int((((a0 >= b0) & (a1 <= b1)) | ((b0 >= a0) & (b1 <= a1))).sum())
 
 
 def part2(pairs: InputData) -> int:
-    count = 0
-    for a, b in pairs:
-        if not ((a[1] < b[0]) or (b[1] < a[0])):
-            count += 1
-    return count
+    a0, a1, b0, b1 = pairs.T
+    return int(((a1 >= b0) & (b1 >= a0)).sum())
+
+
+class IntervalIndex:
+    """
+    Sorted start and end sections of every assignment, across all pairs.
+    An assignment overlaps [start, end] unless it ends before start or begins after end. Assignments ending before
+    start are a subset of those beginning at or before end, so overlaps can be counted with two binary searches.
+    """
+    def __init__(self, pairs: InputData):
+        self.ranges: np.ndarray = pairs.reshape(-1, 2)
+        self.starts: np.ndarray = np.sort(self.ranges[:, 0])
+        self.ends: np.ndarray = np.sort(self.ranges[:, 1])
+
+    def overlap_counts(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Number of assignments overlapping each of the ranges [starts[i], ends[i]]."""
+        return np.searchsorted(self.starts, ends, side="right") - np.searchsorted(self.ends, starts, side="left")
+
+    def overlap_count(self, start: int, end: int) -> int:
+        """Number of assignments overlapping the range [start, end]."""
+        return int(self.overlap_counts(np.array([start]), np.array([end]))[0])
+
+    def coverage(self, section: int) -> int:
+        """Number of assignments that include section."""
+        return self.overlap_count(section, section)
+
+    def overlapping_pairs(self) -> int:
+        """Number of unordered pairs of distinct assignments, from anywhere in the input, that overlap each other."""
+        counts = self.overlap_counts(self.ranges[:, 0], self.ranges[:, 1])
+        # Every assignment overlaps itself, and every other overlapping pair is counted from both sides.
+        return int((counts.sum() - len(self.ranges)) // 2)
 
 
 if __name__ == "__main__":
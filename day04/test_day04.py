@@ -1,6 +1,8 @@
 from day04 import *
 
 from pathlib import Path
+import itertools
+import pytest
 
 
 def load_answer(path: Path) -> int:
@@ -30,3 +32,35 @@ def test_part1(input_path: Path, answer1: int) -> None:
 
 def test_part2(input_path: Path, answer2: int) -> None:
     assert part2(load(input_path)) == answer2
+
+
+def test_interval_index(input_path: Path, answer2: int) -> None:
+    pairs = load(input_path)
+    index = IntervalIndex(pairs)
+    ranges = pairs.reshape(-1, 2).tolist()
+
+    assert index.overlapping_pairs() == sum([1 for (a0, a1), (b0, b1) in itertools.combinations(ranges, 2) if a1 >= b0 and b1 >= a0])
+    # Within-pair overlaps are a subset of all overlaps across the file.
+    assert index.overlapping_pairs() >= answer2
+
+    lowest = min([r[0] for r in ranges]) - 1
+    highest = max([r[1] for r in ranges]) + 1
+    for start in range(lowest, highest + 1):
+        assert index.coverage(start) == sum([1 for r0, r1 in ranges if r0 <= start <= r1])
+        for end in range(start, highest + 1):
+            assert index.overlap_count(start, end) == sum([1 for r0, r1 in ranges if r1 >= start and end >= r0])
+
+
+def test_load_malformed(input_path: Path, answer1: int, tmp_path: Path) -> None:
+    # Lines that split a pair across lines mustn't be silently re-paired.
+    bad_path = tmp_path / "input"
+    with open(bad_path, "wb") as f:
+        f.write(b"2-4\n6-8,1-2,3-4\n")
+    with pytest.raises(ValueError):
+        load(bad_path)
+    # A missing final newline is fine.
+    with open(input_path, "rb") as f:
+        contents = f.read().rstrip(b"\n")
+    with open(bad_path, "wb") as f:
+        f.write(contents)
+    assert part1(load(bad_path)) == answer1
@@ -3,55 +3,159 @@
 import argparse
 import sys
 from pathlib import Path
+import typing
+import array
+import itertools
 
 StartingStacks = list[list[str]]
-Moves = list[tuple[int, int, int]]
+# Moves packed as consecutive (count, from stack, to stack) triples, with stacks numbered from 0
+Moves = array.array
 InputData = tuple[StartingStacks, Moves]
 
+# Approximate number of bytes of move lines to parse at once
+MOVE_CHUNK_SIZE = 1 << 20
 
-def load(input_path: Path) -> InputData:
+
+def load_stacks(f: typing.TextIO) -> StartingStacks:
+    """Read the starting stacks from f, leaving it positioned at the first move."""
     starting_stacks = []
-    moves = []
+    while True:
+        line = f.readline()[:-1]  # Remove newline.
+        if not line.strip().startswith("["):
+            # This should be the stack numbers line (1 2 3...).
+            # Also skip the blank line.
+            f.readline()
+            break
+        for _ in range(len(starting_stacks), (len(line) + 1) // 4):
+            starting_stacks.append([])
+        for i in range((len(line) + 1) // 4):
+            if (c := line[i * 4 + 1]) != " ":
+                starting_stacks[i].append(c)
+    return [list(reversed(l)) for l in starting_stacks]
+
+
+def parse_moves(f: typing.TextIO) -> typing.Generator[tuple[int, int, int], None, None]:
+    """Yield each remaining move in f as (count, from stack, to stack), parsing a chunk of lines at a time."""
+    while lines := f.readlines(MOVE_CHUNK_SIZE):
+        # Every line is "move <count> from <from> to <to>".
+        words = "".join(lines).split()
+        yield from zip(map(int, words[1::6]), [int(w) - 1 for w in words[3::6]], [int(w) - 1 for w in words[5::6]])
+
+
+def move_count(moves: Moves) -> int:
+    return len(moves) // 3
+
+
+def get_move(moves: Moves, i: int) -> tuple[int, int, int]:
+    return moves[i * 3], moves[i * 3 + 1], moves[i * 3 + 2]
+
+
+def iter_moves(moves: Moves, start: int = 0, stop: int | None = None) -> typing.Iterator[tuple[int, int, int]]:
+    """Moves start to stop (by move number, not array index) as (count, from stack, to stack) tuples."""
+    if stop is None:
+        stop = move_count(moves)
+    return zip(*[iter(moves[start * 3:stop * 3])] * 3)
+
+
+def load(input_path: Path) -> InputData:
     with open(input_path) as f:
-        while True:
-            line = f.readline()[:-1]  # Remove newline.
-            if not line.strip().startswith("["):
-                # This should be the stack numbers line (1 2 3...).
-                # Also skip the blank line.
-                f.readline()
-                break
-            for _ in range(len(starting_stacks), (len(line) + 1) // 4):
-                starting_stacks.append([])
-            for i in range((len(line) + 1) // 4):
-                if (c := line[i * 4 + 1]) != " ":
-                    starting_stacks[i].append(c)
-        starting_stacks = [list(reversed(l)) for l in starting_stacks]
-
-        while True:
-            line = f.readline()
-            if not line:
-                break
-            line = line.strip().split(" ")
-            moves.append((int(line[1]), int(line[3]) - 1, int(line[5]) - 1))
+        starting_stacks = load_stacks(f)
+        moves = array.array("i", itertools.chain.from_iterable(parse_moves(f)))
     return starting_stacks, moves
 
 
-def part1(input_data: InputData) -> str:
-    stacks, moves = input_data
+def run_crane(stacks: StartingStacks, moves: typing.Iterable[tuple[int, int, int]], reverse: bool) -> StartingStacks:
+    """
+    Apply moves to stacks, returning the resulting stacks. If reverse, crates are moved one at a time (CrateMover 9000),
+    otherwise all at once (CrateMover 9001).
+    stacks is left untouched; each stack is only copied the first time a move changes it.
+    """
+    stacks = list(stacks)
+    copied = [False] * len(stacks)
     for count, s_from, s_to in moves:
         assert s_from != s_to
-        stacks[s_to].extend(reversed(stacks[s_from][-count:]))
-        stacks[s_from] = stacks[s_from][:-count]
-    return "".join([l[-1] for l in stacks])
+        for s in s_from, s_to:
+            if not copied[s]:
+                stacks[s] = list(stacks[s])
+                copied[s] = True
+        split = len(stacks[s_from]) - count
+        moved = stacks[s_from][split:]
+        del stacks[s_from][split:]
+        if reverse:
+            moved.reverse()
+        stacks[s_to].extend(moved)
+    return stacks
+
+
+def top_crates(stacks: StartingStacks) -> str:
+    return "".join([l[-1] for l in stacks if l])
+
+
+def trace_top_crates(input_data: InputData, reverse: bool) -> str:
+    """
+    Top crates after all moves, found by tracing each final top position backwards through the moves to the
+    starting stacks, rather than moving any crates. Costs O(stacks * moves), however many crates each move carries.
+    """
+    stacks, moves = input_data
+    heights = [len(l) for l in stacks]
+    for count, s_from, s_to in iter_moves(moves):
+        heights[s_from] -= count
+        heights[s_to] += count
+
+    tops = []
+    for stack in range(len(stacks)):
+        if heights[stack] == 0:
+            continue
+        # Position is (stack, depth), with depth 0 the top crate.
+        s, depth = stack, 0
+        for i in range(move_count(moves) - 1, -1, -1):
+            count, s_from, s_to = get_move(moves, i)
+            if s == s_to:
+                if depth < count:
+                    # This crate was carried here by this move.
+                    s = s_from
+                    if reverse:
+                        depth = count - 1 - depth
+                else:
+                    depth -= count
+            elif s == s_from:
+                depth += count
+        tops.append(stacks[s][-1 - depth])
+    return "".join(tops)
+
+
+class CraneReplay:
+    """
+    Stacks after any number of moves, for repeated queries against the same input.
+    A snapshot of the stacks is stored every interval moves, so each query only replays the moves since the
+    nearest snapshot before it.
+    """
+    def __init__(self, input_data: InputData, reverse: bool, interval: int = 1000):
+        stacks, self.moves = input_data
+        self.reverse: bool = reverse
+        self.interval: int = interval
+        # snapshots[i] is the stacks after i * interval moves, with each stack stored as a string of crates.
+        self.snapshots: list[tuple[str, ...]] = []
+        for i in range(0, move_count(self.moves) + 1, interval):
+            self.snapshots.append(tuple(["".join(l) for l in stacks]))
+            stacks = run_crane(stacks, iter_moves(self.moves, i, min(i + interval, move_count(self.moves))), reverse)
+
+    def stacks_after(self, moves_made: int) -> StartingStacks:
+        """Stacks after the first moves_made moves have been made."""
+        assert 0 <= moves_made <= move_count(self.moves)
+        snapshot = moves_made // self.interval
+        stacks = [list(l) for l in self.snapshots[snapshot]]
+        return run_crane(stacks, iter_moves(self.moves, snapshot * self.interval, moves_made), self.reverse)
+
+
+def part1(input_data: InputData) -> str:
+    stacks, moves = input_data
+    return top_crates(run_crane(stacks, iter_moves(moves), True))
 
 
 def part2(input_data: InputData) -> str:
     stacks, moves = input_data
-    for count, s_from, s_to in moves:
-        assert s_from != s_to
-        stacks[s_to].extend(stacks[s_from][-count:])
-        stacks[s_from] = stacks[s_from][:-count]
-    return "".join([l[-1] for l in stacks])
+    return top_crates(run_crane(stacks, iter_moves(moves), False))
 
 
 if __name__ == "__main__":
@@ -64,8 +168,7 @@ if __name__ == "__main__":
     if args.part1 == args.part2:
         sys.exit("Exactly one of --part1 or --part2 must be specified.")
 
-    data = load(Path(args.input))
-    if args.part1:
-        print(part1(data))
-    else:  # part2
-        print(part2(data))
+    # Stream the moves straight into the crane, so they never all need to be held in memory.
+    with open(Path(args.input)) as f:
+        stacks = load_stacks(f)
+        print(top_crates(run_crane(stacks, parse_moves(f), args.part1)))
@@ -30,3 +30,40 @@ def test_part1(input_path: Path, answer1: str) -> None:
 
 def test_part2(input_path: Path, answer2: str) -> None:
     assert part2(load(input_path)) == answer2
+
+
+def test_reuse_loaded(input_path: Path, answer2: str) -> None:
+    # Solving part 1 mustn't disturb the loaded stacks used by part 2.
+    data = load(input_path)
+    part1(data)
+    assert part2(data) == answer2
+
+
+def test_trace_part1(input_path: Path, answer1: str) -> None:
+    assert trace_top_crates(load(input_path), True) == answer1
+
+
+def test_trace_part2(input_path: Path, answer2: str) -> None:
+    assert trace_top_crates(load(input_path), False) == answer2
+
+
+def check_replay(data: InputData, reverse: bool) -> None:
+    # Every move count, including 0 and those on snapshot boundaries, for intervals from one snapshot per move to
+    # a single snapshot of the starting stacks.
+    moves_total = move_count(data[1])
+    for interval in sorted({1, 2, 3, moves_total, moves_total + 1}):
+        replay = CraneReplay(data, reverse, interval)
+        for k in range(moves_total + 1):
+            assert replay.stacks_after(k) == run_crane(data[0], iter_moves(data[1], 0, k), reverse)
+
+
+def test_replay_part1(input_path: Path, answer1: str) -> None:
+    data = load(input_path)
+    check_replay(data, True)
+    assert top_crates(CraneReplay(data, True, 3).stacks_after(move_count(data[1]))) == answer1
+
+
+def test_replay_part2(input_path: Path, answer2: str) -> None:
+    data = load(input_path)
+    check_replay(data, False)
+    assert top_crates(CraneReplay(data, False, 3).stacks_after(move_count(data[1]))) == answer2
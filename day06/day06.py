@@ -3,34 +3,128 @@
 import argparse
 import sys
 from pathlib import Path
+import typing
+import numpy as np
 
-InputData = list[str]
+InputData = bytes
 
 
 def load(input_path: Path) -> InputData:
-    with open(input_path) as f:
-        return list(f.readline().strip())
+    with open(input_path, "rb") as f:
+        return f.readline().strip()
+
+
+class MarkerDetector:
+    """
+    Finds the first run of window distinct bytes in a signal that is fed in one chunk at a time.
+    Keeps a count of each byte value in the window, and how many of those counts are non-zero, so each byte is
+    only looked at as it enters and leaves the window.
+    """
+    def __init__(self, window: int):
+        self.window: int = window
+        self.counts: list[int] = [0] * 256
+        self.distinct: int = 0
+        self.position: int = 0  # Bytes consumed so far
+        self.history: bytes = b""  # The last (up to) window bytes consumed
+        self.marker: int | None = None
+
+    def feed(self, chunk: bytes) -> int | None:
+        """Consume the next chunk of the signal, returning the marker position once it has been found."""
+        if self.marker is not None:
+            return self.marker
+
+        # Prefix the chunk with enough history that the byte leaving the window can always be found.
+        # Indices into data then equal positions in the signal until the history is full, and are at least
+        # window once it is, so "i >= window" is the test for whether a byte is leaving the window.
+        data = self.history + chunk
+        counts = self.counts
+        distinct = self.distinct
+        for i in range(len(self.history), len(data)):
+            c = data[i]
+            if counts[c] == 0:
+                distinct += 1
+            counts[c] += 1
+            if i >= self.window:
+                old = data[i - self.window]
+                counts[old] -= 1
+                if counts[old] == 0:
+                    distinct -= 1
+            if distinct == self.window:
+                self.marker = self.position + i - len(self.history) + 1
+                break
+
+        self.distinct = distinct
+        self.position += len(chunk)
+        self.history = data[-self.window:]
+        return self.marker
+
+
+def find_marker(input_data: InputData, window: int) -> int | None:
+    """Number of bytes read up to the end of the first run of window distinct bytes, or None if there isn't one."""
+    return MarkerDetector(window).feed(input_data)
+
+
+def stream_markers(f: typing.BinaryIO, windows: list[int], chunk_size: int = 1 << 16) -> dict[int, int | None]:
+    """
+    First marker position for each window size, reading f one chunk at a time.
+    All window sizes are found in the same pass, which stops as soon as every marker has been found.
+    """
+    detectors = [MarkerDetector(w) for w in windows]
+    while any(d.marker is None for d in detectors) and (chunk := f.read(chunk_size)):
+        # Line endings aren't part of the signal.
+        chunk = chunk.translate(None, b"\r\n")
+        for d in detectors:
+            d.feed(chunk)
+    return {d.window: d.marker for d in detectors}
+
+
+def all_markers(input_data: InputData, window: int) -> np.ndarray:
+    """
+    Every marker position in the signal, that is every number of bytes read at which the last window bytes are
+    all distinct.
+    """
+    signal = np.frombuffer(input_data, dtype=np.uint8)
+    # Index of the previous occurrence of each byte's value, or -1. A stable sort groups equal byte values
+    # together while keeping them in signal order.
+    order = np.argsort(signal, kind="stable")
+    same_as_previous = signal[order[1:]] == signal[order[:-1]]
+    previous = np.full(len(signal), -1, dtype=np.int64)
+    previous[order[1:][same_as_previous]] = order[:-1][same_as_previous]
+    # The window ending at i is distinct if no byte in it repeats an earlier byte in the window. Any repeat
+    # before the window started must point to an even earlier position, so the running maximum of previous
+    # over the whole signal so far can be used, rather than a maximum over each window.
+    latest_repeat = np.maximum.accumulate(previous)
+    window_starts = np.arange(len(signal) - window + 1)
+    return np.flatnonzero(latest_repeat[window - 1:] < window_starts) + window
 
 
 def part1(input_data: InputData) -> int:
-    for i in range(len(input_data) - 3):
-        if len(set(input_data[i:i+4])) == 4:
-            return i + 4
+    return find_marker(input_data, 4)
 
 
 def part2(input_data: InputData) -> int:
-    for i in range(len(input_data) - 13):
-        if len(set(input_data[i:i + 14])) == 14:
-            return i + 14
+    return find_marker(input_data, 14)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-1", "--part1", action="store_true")
     parser.add_argument("-2", "--part2", action="store_true")
-    parser.add_argument("input")
+    parser.add_argument("-w", "--window", type=int, action="append", help="stream the input, and report the first marker for window size WINDOW (may be repeated)")
+    parser.add_argument("input", help="input file, or - for stdin")
     args = parser.parse_args()
 
+    if args.window:
+        if args.part1 or args.part2:
+            sys.exit("--window cannot be combined with --part1 or --part2.")
+        if any(w < 1 for w in args.window):
+            sys.exit("--window must be at least 1.")
+        with (open(args.input, "rb") if args.input != "-" else sys.stdin.buffer) as f:
+            markers = stream_markers(f, args.window)
+        for w in args.window:
+            print(markers[w])
+        sys.exit()
+
     if args.part1 == args.part2:
         sys.exit("Exactly one of --part1 or --part2 must be specified.")
 
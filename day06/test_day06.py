@@ -30,3 +30,27 @@ def test_part1(input_path: Path, answer1: int) -> None:
 
 def test_part2(input_path: Path, answer2: int) -> None:
     assert part2(load(input_path)) == answer2
+
+
+def test_stream_part1(input_path: Path, answer1: int) -> None:
+    with open(input_path, "rb") as f:
+        assert stream_markers(f, [4, 14], chunk_size=3)[4] == answer1
+
+
+def test_stream_part2(input_path: Path, answer2: int) -> None:
+    with open(input_path, "rb") as f:
+        assert stream_markers(f, [4, 14], chunk_size=3)[14] == answer2
+
+
+def test_all_markers_part1(input_path: Path, answer1: int) -> None:
+    s = load(input_path)
+    markers = all_markers(s, 4).tolist()
+    assert markers == [i + 4 for i in range(len(s) - 4 + 1) if len(set(s[i:i + 4])) == 4]
+    assert markers[0] == answer1
+
+
+def test_all_markers_part2(input_path: Path, answer2: int) -> None:
+    s = load(input_path)
+    for w in range(1, 15):
+        assert all_markers(s, w).tolist() == [i + w for i in range(len(s) - w + 1) if len(set(s[i:i + w])) == w]
+    assert all_markers(s, 14)[0] == answer2
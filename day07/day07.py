@@ -3,6 +3,10 @@
 import argparse
 import sys
 from pathlib import Path
+import typing
+import array
+import bisect
+import itertools
 
 
 class CdCommand:
@@ -24,6 +28,10 @@ class LsCommand:
 
 InputData = list[CdCommand | LsCommand]
 
+SMALL_DIR_LIMIT = 100000
+DISK_SIZE = 70000000
+UPDATE_SIZE = 30000000
+
 
 def load(input_path: Path) -> InputData:
     commands: InputData = []
@@ -52,75 +60,278 @@ class PuzzleFile:
 
 class PuzzleDir:
     def __init__(self):
+        self.parent: PuzzleDir | None = None
         self.contents: dict[str, PuzzleDir | PuzzleFile] = {}
+        # Total size of everything below this directory. Kept up to date by add and remove, so contents should
+        # only be changed through those.
+        self.size_: int = 0
 
     def size(self) -> int:
-        return sum([x.size() for x in self.contents.values()])
+        return self.size_
+
+    def add(self, name: str, item: "PuzzleDir | PuzzleFile") -> None:
+        """
+        Add item to this directory, replacing anything already called name.
+        A directory that already has a parent is moved, so it is removed from its old parent first.
+        """
+        if isinstance(item, PuzzleDir) and item.parent is not None:
+            d = self
+            while d is not None:
+                assert d is not item, "Can't move a directory inside itself"
+                d = d.parent
+            item.parent.remove(next(n for n, x in item.parent.contents.items() if x is item))
+        self.remove(name)
+        self.contents[name] = item
+        if isinstance(item, PuzzleDir):
+            item.parent = self
+        self.grow(item.size())
+
+    def remove(self, name: str) -> int:
+        """Remove name from this directory if present, returning the size freed."""
+        if (item := self.contents.pop(name, None)) is None:
+            return 0
+        if isinstance(item, PuzzleDir):
+            item.parent = None
+        self.grow(-item.size())
+        return item.size()
+
+    def grow(self, delta: int) -> None:
+        """Adjust the cached size of this directory and all of its ancestors."""
+        d = self
+        while d is not None:
+            d.size_ += delta
+            d = d.parent
 
 
 def BuildFsTree(input_data: InputData) -> PuzzleDir:
-    working_dir = "/"
     root = PuzzleDir()
+    d = root
 
     for cmd in input_data:
         if isinstance(cmd, CdCommand):
             if cmd.target == "/":
-                working_dir = "/"
+                d = root
             elif cmd.target == "..":
-                working_dir = working_dir[:working_dir.rfind("/")] if working_dir.count("/") > 1 else "/"
+                d = d.parent if d.parent is not None else root
             else:
-                working_dir += ("/" if working_dir != "/" else "") + cmd.target
+                d = d.contents[cmd.target]
         elif isinstance(cmd, LsCommand):
-            d = root
-            for sd in filter(None, working_dir.split("/")):
-                d = d.contents[sd]
             for x in cmd.files.keys():
-                d.contents[x] = PuzzleFile(cmd.files[x])
+                d.add(x, PuzzleFile(cmd.files[x]))
             for x in cmd.dirs:
-                d.contents[x] = PuzzleDir()
+                # Don't replace a directory that's already been explored if it's listed again.
+                if x not in d.contents:
+                    d.add(x, PuzzleDir())
 
     return root
 
 
-def part1(input_data: InputData) -> int:
-    root = BuildFsTree(input_data)
-
-    def get_small_dirs(pd: PuzzleDir) -> list[int]:
-        l = []
-        if (s := pd.size()) <= 100000:
-            l.append(s)
-        for sd in pd.contents.values():
-            if isinstance(sd, PuzzleDir):
-                l.extend(get_small_dirs(sd))
+def dir_sizes(pd: PuzzleDir) -> list[int]:
+    """Sizes of pd and every directory below it."""
+    l = [pd.size()]
+    for sd in pd.contents.values():
+        if isinstance(sd, PuzzleDir):
+            l.extend(dir_sizes(sd))
+    return l
+
+
+class CompactFsTree:
+    """
+    Directory tree stored as parallel arrays indexed by directory number, with the root as directory 0.
+    Files don't get nodes of their own, their sizes are added to their directory's own size.
+    Children are linked through first_children and next_siblings, and names are stored once each in names and
+    referred to by number, so each directory costs six array entries (32 bytes).
+    A directory is always numbered after its parent, so subtree sizes can be summed in a single reverse pass.
+    """
+    def __init__(self):
+        self.parents: array.array = array.array("i", [-1])
+        self.own_sizes: array.array = array.array("q", [0])
+        self.subtree_sizes: array.array = array.array("q")  # Filled in by aggregate
+        self.name_ids: array.array = array.array("i", [-1])
+        self.first_children: array.array = array.array("i", [-1])
+        self.next_siblings: array.array = array.array("i", [-1])
+        self.names: dict[str, int] = {}  # Each distinct name, and its number
+        # Name number to child lookups, only kept for directories on the current path.
+        self.lookups: dict[int, dict[int, int]] = {}
+
+    def lookup(self, parent: int) -> dict[int, int]:
+        if (l := self.lookups.get(parent)) is None:
+            l = self.lookups[parent] = {}
+            c = self.first_children[parent]
+            while c != -1:
+                l[self.name_ids[c]] = c
+                c = self.next_siblings[c]
         return l
 
-    return sum(get_small_dirs(root))
+    def forget(self, d: int) -> None:
+        """Drop the child lookup for d, once the current path no longer passes through it."""
+        self.lookups.pop(d, None)
+
+    def child(self, parent: int, name: str) -> int:
+        """Number of the directory called name within parent, adding it if it's new."""
+        name_id = self.names.setdefault(name, len(self.names))
+        l = self.lookup(parent)
+        if (d := l.get(name_id)) is None:
+            d = l[name_id] = len(self.parents)
+            self.parents.append(parent)
+            self.own_sizes.append(0)
+            self.name_ids.append(name_id)
+            self.first_children.append(-1)
+            self.next_siblings.append(self.first_children[parent])
+            self.first_children[parent] = d
+        return d
+
+    def aggregate(self) -> None:
+        self.subtree_sizes = array.array("q", self.own_sizes)
+        for d in range(len(self.parents) - 1, 0, -1):
+            self.subtree_sizes[self.parents[d]] += self.subtree_sizes[d]
+
+
+def build_compact_tree(input_data: InputData) -> CompactFsTree:
+    tree = CompactFsTree()
+    d = 0
+
+    for cmd in input_data:
+        if isinstance(cmd, CdCommand):
+            if cmd.target == "/":
+                while d != 0:
+                    tree.forget(d)
+                    d = tree.parents[d]
+            elif cmd.target == "..":
+                if d != 0:
+                    tree.forget(d)
+                    d = tree.parents[d]
+            else:
+                d = tree.child(d, cmd.target)
+        elif isinstance(cmd, LsCommand):
+            # A repeated listing replaces the files from the previous one.
+            tree.own_sizes[d] = sum(cmd.files.values())
+            for x in cmd.dirs:
+                tree.child(d, x)
+
+    tree.lookups.clear()
+    tree.aggregate()
+    return tree
+
+
+class SizeIndex:
+    """
+    Directory sizes sorted once, with running totals, so that threshold queries against the same tree are
+    binary searches.
+    """
+    def __init__(self, sizes: typing.Iterable[int]):
+        self.sizes: list[int] = sorted(sizes)
+        self.prefix_sums: list[int] = [0, *itertools.accumulate(self.sizes)]
+
+    def smallest_at_least(self, threshold: int) -> int | None:
+        """Size of the smallest directory of at least threshold, or None if there isn't one."""
+        i = bisect.bisect_left(self.sizes, threshold)
+        return self.sizes[i] if i < len(self.sizes) else None
+
+    def sum_at_most(self, threshold: int) -> int:
+        """Total size of all directories of at most threshold."""
+        return self.prefix_sums[bisect.bisect_right(self.sizes, threshold)]
+
+    def smallest_to_free(self, disk_size: int, space_required: int) -> int | None:
+        """Size of the smallest directory that, if deleted, would leave space_required free on a disk of disk_size."""
+        # The root directory contains everything, so is the largest.
+        return self.smallest_at_least(space_required - disk_size + self.sizes[-1])
+
+
+def part1(input_data: InputData) -> int:
+    index = SizeIndex(build_compact_tree(input_data).subtree_sizes)
+    return index.sum_at_most(SMALL_DIR_LIMIT)
 
 
 def part2(input_data: InputData) -> int:
-    root = BuildFsTree(input_data)
-    space_required = 30000000 - 70000000 + root.size()
-
-    def get_sizes(pd: PuzzleDir) -> list[int]:
-        l = [pd.size()]
-        for sd in pd.contents.values():
-            if isinstance(sd, PuzzleDir):
-                l.extend(get_sizes(sd))
-        return l
+    index = SizeIndex(build_compact_tree(input_data).subtree_sizes)
+    return index.smallest_to_free(DISK_SIZE, UPDATE_SIZE)
+
+
+def stream_dir_sizes(input_path: Path) -> typing.Generator[int, None, None]:
+    """
+    Yield the total size of every directory, straight from the terminal transcript, with the root directory last.
+    A directory's size is yielded when it is left, and folded into its parent's, so only the sizes of the
+    directories on the current path are ever held.
+    Requires a depth-first transcript, where each directory is entered and listed at most once, and raises
+    ValueError otherwise. Each directory on the current path remembers which subdirectories it has entered, so
+    re-entering any directory is caught at its parent.
+    """
+    # Running size of the working directory and its ancestors, root first, with the names of the subdirectories
+    # each has entered, and whether it has been listed.
+    sizes = [0]
+    entered: list[set[str]] = [set()]
+    listed = [False]
+
+    def leave() -> int:
+        entered.pop()
+        listed.pop()
+        size = sizes.pop()
+        sizes[-1] += size
+        return size
+
+    with open(input_path) as f:
+        for line in f:
+            line = line.split()
+            if not line:
+                continue
+            if line[:2] == ["$", "cd"]:
+                if line[2] == "/":
+                    while len(sizes) > 1:
+                        yield leave()
+                elif line[2] == "..":
+                    if len(sizes) > 1:
+                        yield leave()
+                else:
+                    if line[2] in entered[-1]:
+                        raise ValueError(f"Directory {line[2]} entered more than once, so can't be streamed")
+                    entered[-1].add(line[2])
+                    sizes.append(0)
+                    entered.append(set())
+                    listed.append(False)
+            elif line == ["$", "ls"]:
+                if listed[-1]:
+                    raise ValueError("Directory listed more than once, so can't be streamed")
+                listed[-1] = True
+            elif line[0] != "dir":
+                sizes[-1] += int(line[0])
+
+    while len(sizes) > 1:
+        yield leave()
+    yield sizes[0]
 
-    return next(filter(lambda x: x >= space_required, sorted(get_sizes(root))))
+
+def stream_part1(input_path: Path) -> int:
+    return sum([s for s in stream_dir_sizes(input_path) if s <= SMALL_DIR_LIMIT])
+
+
+def stream_part2(input_path: Path) -> int:
+    sizes = list(stream_dir_sizes(input_path))
+    space_required = UPDATE_SIZE - DISK_SIZE + sizes[-1]
+    return min([s for s in sizes if s >= space_required])
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-1", "--part1", action="store_true")
     parser.add_argument("-2", "--part2", action="store_true")
+    parser.add_argument("-s", "--stream", action="store_true", help="work straight from the transcript without building the filesystem tree; requires each directory to be entered and listed at most once")
     parser.add_argument("input")
     args = parser.parse_args()
 
     if args.part1 == args.part2:
         sys.exit("Exactly one of --part1 or --part2 must be specified.")
 
+    if args.stream:
+        try:
+            if args.part1:
+                print(stream_part1(Path(args.input)))
+            else:  # part2
+                print(stream_part2(Path(args.input)))
+        except ValueError as e:
+            sys.exit(str(e))
+        sys.exit()
+
     data = load(Path(args.input))
     if args.part1:
         print(part1(data))
@@ -1,6 +1,7 @@
 from day07 import *
 
 from pathlib import Path
+import pytest
 
 
 def load_answer(path: Path) -> int:
@@ -30,3 +31,84 @@ def test_part1(input_path: Path, answer1: int) -> None:
 
 def test_part2(input_path: Path, answer2: int) -> None:
     assert part2(load(input_path)) == answer2
+
+
+def test_stream_part1(input_path: Path, answer1: int) -> None:
+    assert stream_part1(input_path) == answer1
+
+
+def test_stream_part2(input_path: Path, answer2: int) -> None:
+    assert stream_part2(input_path) == answer2
+
+
+def test_stream_revisits(input_path: Path, answer1: int, tmp_path: Path) -> None:
+    # Re-entering or re-listing a directory would split or double its size, so must be rejected.
+    with open(input_path) as f:
+        transcript = f.read()
+    revisited_path = tmp_path / "input"
+    first_dir = next(line.split()[2] for line in transcript.splitlines() if line.startswith("$ cd ") and line.split()[2] not in ("/", ".."))
+    for revisit in ["$ cd /\n" + transcript, "$ cd /\n$ cd " + first_dir + "\n", "$ cd /\n$ ls\n"]:
+        with open(revisited_path, "w") as f:
+            f.write(transcript + revisit)
+        with pytest.raises(ValueError):
+            stream_part1(revisited_path)
+        assert part1(load(revisited_path)) == answer1
+
+
+def test_fs_tree_part1(input_path: Path, answer1: int) -> None:
+    assert sum([s for s in dir_sizes(BuildFsTree(load(input_path))) if s <= SMALL_DIR_LIMIT]) == answer1
+
+
+def test_fs_tree_mutations(input_path: Path, answer1: int, tmp_path: Path) -> None:
+    root = BuildFsTree(load(input_path))
+
+    def full_size(pd: PuzzleDir) -> int:
+        return sum([full_size(x) if isinstance(x, PuzzleDir) else x.size() for x in pd.contents.values()])
+
+    def check(pd: PuzzleDir) -> None:
+        assert pd.size() == full_size(pd)
+        for x in pd.contents.values():
+            if isinstance(x, PuzzleDir):
+                assert x.parent is pd
+                check(x)
+
+    check(root)
+    deepest = root
+    while subdirs := [x for x in deepest.contents.values() if isinstance(x, PuzzleDir)]:
+        deepest = subdirs[0]
+
+    # Add, then replace, a file deep in the tree.
+    deepest.add("new_file", PuzzleFile(1000))
+    check(root)
+    deepest.add("new_file", PuzzleFile(10))
+    check(root)
+
+    # Add a directory, and grow it after it has been attached.
+    sub = PuzzleDir()
+    sub.add("x", PuzzleFile(5))
+    deepest.add("sub", sub)
+    sub.add("y", PuzzleFile(7))
+    check(root)
+
+    # Move the directory up to the root, then replace it with a file.
+    root.add("moved", sub)
+    assert "sub" not in deepest.contents
+    check(root)
+    root.add("moved", PuzzleFile(3))
+    assert sub.parent is None
+    check(root)
+
+    # Remove a whole top-level directory.
+    root.remove(next(n for n, x in root.contents.items() if isinstance(x, PuzzleDir)))
+    check(root)
+
+    # Listing directories again, after exploring their subdirectories, mustn't discard what was found in them.
+    with open(input_path) as f:
+        transcript = f.read()
+    relisted_path = tmp_path / "input"
+    with open(relisted_path, "w") as f:
+        f.write(transcript + "$ cd /\n" + transcript)
+    relisted = BuildFsTree(load(relisted_path))
+    check(relisted)
+    assert sorted(dir_sizes(relisted)) == sorted(dir_sizes(BuildFsTree(load(input_path))))
+    assert sum([s for s in dir_sizes(relisted) if s <= SMALL_DIR_LIMIT]) == answer1 == part1(load(relisted_path))
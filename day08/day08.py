@@ -3,96 +3,60 @@
 import argparse
 import sys
 from pathlib import Path
-import math
+import numpy as np
 
-# List of rows, data[row][col]
-InputData = list[list[int]]
+# Tree heights, data[row, col]
+InputData = np.ndarray
 
 
 def load(input_path: Path) -> InputData:
-    trees: InputData = []
-    with open(input_path) as f:
-        while line := f.readline().strip():
-            trees.append([int(x) for x in list(line)])
-    return trees
-
-
-def scan_row(input_data: InputData, visible: list[list[bool]], row: int) -> None:
-    cols = len(input_data[0])
-
-    # Left-to-right
-    peak_height = input_data[row][0]
-    visible[row][0] = True
-    for col in range(1, cols):
-        if input_data[row][col] > peak_height:
-            peak_height = input_data[row][col]
-            visible[row][col] = True
-
-    # Right-to-left
-    peak_height = input_data[row][cols-1]
-    visible[row][cols-1] = True
-    for col in range(cols-1, -1, -1):
-        if input_data[row][col] > peak_height:
-            peak_height = input_data[row][col]
-            visible[row][col] = True
-
-
-def scan_col(input_data: InputData, visible: list[list[bool]], col: int) -> None:
-    rows = len(input_data)
-
-    # Top-to-bottom
-    peak_height = input_data[0][col]
-    visible[0][col] = True
-    for row in range(1, rows):
-        if input_data[row][col] > peak_height:
-            peak_height = input_data[row][col]
-            visible[row][col] = True
-
-    # Bottom-to-top
-    peak_height = input_data[rows-1][col]
-    visible[rows-1][col] = True
-    for row in range(rows-1, -1, -1):
-        if input_data[row][col] > peak_height:
-            peak_height = input_data[row][col]
-            visible[row][col] = True
+    with open(input_path, "rb") as f:
+        rows = f.read().split()
+    return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), -1) - ord("0")
 
 
-def part1(input_data: InputData) -> int:
-    rows = len(input_data)
-    cols = len(input_data[0])
-    visible = [[False for c in range(cols)] for r in range(rows)]
-
-    for row in range(rows):
-        scan_row(input_data, visible, row)
-    for col in range(cols):
-        scan_col(input_data, visible, col)
-
-    return sum([sum([1 if x else 0 for x in row]) for row in visible])
+def visible_from_left(input_data: InputData) -> np.ndarray:
+    """Which trees can be seen from the left edge of the grid."""
+    visible = np.ones(input_data.shape, dtype=bool)
+    # A tree is visible if it's taller than the tallest tree before it. Trees on the edge are always visible.
+    tallest = np.maximum.accumulate(input_data, axis=1)
+    visible[:, 1:] = input_data[:, 1:] > tallest[:, :-1]
+    return visible
 
 
-def scenic_score(input_data: InputData, row: int, col: int) -> int:
-    rows = len(input_data)
-    cols = len(input_data[0])
-
-    def scan(dr: int, dc: int) -> int:
-        scan_dist = 0
-        nextr = row + dr
-        nextc = col + dc
-        while 0 <= nextr < rows and 0 <= nextc < cols:
-            scan_dist += 1
-            if input_data[nextr][nextc] >= input_data[row][col]:
-                break
-            nextr += dr
-            nextc += dc
-        return scan_dist
-
-    return math.prod(scan(dr, dc) for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)])
+def part1(input_data: InputData) -> int:
+    # Look from the other edges by flipping and transposing the grid, then flip the results back.
+    visible = visible_from_left(input_data)
+    visible |= visible_from_left(input_data[:, ::-1])[:, ::-1]
+    visible |= visible_from_left(input_data.T).T
+    visible |= visible_from_left(input_data.T[:, ::-1])[:, ::-1].T
+    return int(visible.sum())
+
+
+def viewing_distance_left(input_data: InputData) -> np.ndarray:
+    """How many trees each tree can see looking left, up to and including the first tree at least as tall."""
+    distances = np.zeros(input_data.shape, dtype=np.int64)
+    for row, heights in enumerate(input_data.tolist()):
+        # Columns of trees not yet blocked from view by a later tree, so their heights are strictly decreasing.
+        # Popping the shorter trees leaves the first tree to the left that blocks the view.
+        stack = []
+        row_distances = []
+        for col, height in enumerate(heights):
+            while stack and heights[stack[-1]] < height:
+                stack.pop()
+            row_distances.append(col - stack[-1] if stack else col)
+            stack.append(col)
+        distances[row] = row_distances
+    return distances
 
 
 def part2(input_data: InputData) -> int:
-    rows = len(input_data)
-    cols = len(input_data[0])
-    return max([scenic_score(input_data, row, col) for row in range(1, rows-1) for col in range(1, cols-1)])
+    # Look in the other directions by flipping and transposing the grid, then flip the results back.
+    scores = viewing_distance_left(input_data)
+    scores *= viewing_distance_left(input_data[:, ::-1])[:, ::-1]
+    scores *= viewing_distance_left(input_data.T).T
+    scores *= viewing_distance_left(input_data.T[:, ::-1])[:, ::-1].T
+    return int(scores.max())
 
 
 if __name__ == "__main__":